@@ -1,23 +1,137 @@
 #app.py
 from pathlib import Path
-import os, openai, streamlit as st
-from get_visible_text import visible_text
+from collections.abc import AsyncIterator
+from concurrent.futures import ThreadPoolExecutor
+import asyncio, os, re, openai, streamlit as st
+from get_visible_text import visible_text, visible_texts
 
-# ---------- load rules ----------
+# ---------- load rules (once per server, not on every rerun) ----------
 RULES_PATH = Path(__file__).with_name("translator_rules.txt")
-TRANSLATOR_SYSTEM_PROMPT = RULES_PATH.read_text(encoding="utf-8")
+
+@st.cache_resource
+def system_message() -> dict[str, str]:
+    return {"role": "system", "content": RULES_PATH.read_text(encoding="utf-8")}
 
 openai.api_key = os.getenv("OPENAI_API_KEY")
 
+MODEL = "gpt-4o-mini"
+MAX_TOKENS = 2000
+BATCH_CHARS = 6000  # source chars per request, so the translation fits in MAX_TOKENS
+TRANSLATE_CONCURRENCY = 3  # batches in flight at once; more only invites 429s
+EXTRACT_TIMEOUT = 60  # seconds for a single-URL Extract; batches time out per page
+PARAGRAPH_BREAK = re.compile(r"\n\n+")
+
+# ---------- extraction workers (one pool per server, shared by all sessions) ----------
+@st.cache_resource
+def extract_pool() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(max_workers=4)  # lxml releases the GIL while parsing
+
+# ---------- cached extraction (shared across sessions) ----------
+@st.cache_data(ttl=900, show_spinner=False)
+def cached_visible_text(url: str) -> str:
+    future = extract_pool().submit(visible_text, url)
+    try:
+        return future.result(timeout=EXTRACT_TIMEOUT)
+    except TimeoutError:  # raised, not returned: st.cache_data must not keep it
+        future.cancel()  # frees the slot if it has not started; a running fetch ends on its own
+        raise
+
+def extract_one(url: str) -> str:
+    try:
+        return cached_visible_text(url)
+    except TimeoutError:
+        return f"#URL: {url}\n❌ Error: no response within {EXTRACT_TIMEOUT} s"
+
+# ---------- batch extraction: concurrent fetch, parse in threads ----------
+def extract_many(urls: list[str]) -> str:
+    results = asyncio.run(visible_texts(urls))  # a slow page times out alone, as an entry
+    return "\n\n".join(
+        r if isinstance(r, str) else f"#URL: {u}\n❌ Error: {r}" for u, r in zip(urls, results)
+    )
+
+# ---------- batched translation ----------
+def split_batches(text: str, limit: int = BATCH_CHARS) -> list[str]:
+    """Group the paragraphs of *text* into batches of roughly *limit* characters."""
+    batches, current, size = [], [], 0
+    for para in PARAGRAPH_BREAK.split(text):
+        if current and size + len(para) > limit:
+            batches.append("\n\n".join(current))
+            current, size = [], 0
+        current.append(para)
+        size += len(para) + 2
+    if current:
+        batches.append("\n\n".join(current))
+    return batches
+
+
+async def translate_stream(src_text: str, tgt_lang: str) -> AsyncIterator[str]:
+    """Yield the translation as it is generated.
+
+    Batches are requested concurrently, at most TRANSLATE_CONCURRENCY at a time;
+    their tokens are yielded in batch order.
+    """
+    batches = split_batches(src_text)
+    system = system_message()
+    queues: list[asyncio.Queue] = [asyncio.Queue() for _ in batches]
+    sem = asyncio.Semaphore(TRANSLATE_CONCURRENCY)  # FIFO: the earliest batches go first
+    # one client per call: its connection pool is bound to the running event loop
+    client = openai.AsyncOpenAI(api_key=openai.api_key)
+
+    async def pump(i: int, batch: str) -> None:
+        # only the first batch carries the #URL_PATH/#TITLE/#META_DESC header
+        note = "" if i == 0 else "CONTINUATION: body text only, no path/title/meta sections\n"
+        try:
+            async with sem:
+                stream = await client.chat.completions.create(
+                    model=MODEL,
+                    messages=[
+                        system,
+                        {"role": "user", "content": f"TARGET_LANG = {tgt_lang}\n{note}\n{batch}"},
+                    ],
+                    max_tokens=MAX_TOKENS,
+                    temperature=0.2,
+                    stream=True,
+                )
+                async with stream:
+                    async for chunk in stream:
+                        if chunk.choices and (delta := chunk.choices[0].delta.content):
+                            queues[i].put_nowait(delta)
+            queues[i].put_nowait(None)
+        except Exception as e:
+            queues[i].put_nowait(e)
+
+    async with client:
+        tasks = [asyncio.create_task(pump(i, b)) for i, b in enumerate(batches)]
+        try:
+            for i, queue in enumerate(queues):
+                if i:
+                    yield "\n\n"
+                while (item := await queue.get()) is not None:
+                    if isinstance(item, Exception):
+                        raise item
+                    yield item
+        finally:
+            for t in tasks:
+                t.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await asyncio.sleep(0)  # let openai's finished SSE generators close on this loop
+
 # ---------- extractor tab ----------
 tab_extract, tab_translate = st.tabs(["📝 Extract", "🌍 Translate"])
 
 with tab_extract:
-    url = st.text_input("Paste a URL")
-    if st.button("Extract") and url:
-        text = visible_text(url)
-        st.session_state["last_text"] = text  # save for translation
-        st.text_area("Clean text", text, height=400)
+    urls_raw = st.text_area("Paste one or more URLs (one per line)", height=100)
+    urls = [u.strip() for u in urls_raw.splitlines() if u.strip()]
+    if st.button("Extract") and urls:
+        if urls != st.session_state.get("last_urls"):
+            with st.spinner("Fetching…"):
+                if len(urls) == 1:
+                    text = extract_one(urls[0])
+                else:
+                    text = extract_many(urls)
+            st.session_state["last_text"] = text  # save for translation
+            st.session_state["last_urls"] = urls
+        st.text_area("Clean text", st.session_state["last_text"], height=400)
 
 # ---------- translation chatbot ----------
 with tab_translate:
@@ -40,23 +154,12 @@ with tab_translate:
         with st.chat_message("user"):
             st.markdown(prompt)
 
-        # -------- build conversation w/ rules --------
-        messages = [
-            {"role": "system", "content": TRANSLATOR_SYSTEM_PROMPT},
-            {"role": "user", "content": f"TARGET_LANG = {tgt_lang}\n\n{src_text}"},
-        ]
-
-        try:
-            resp = openai.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=messages,
-                max_tokens=2000,
-                temperature=0.2,
-            )
-            answer = resp.choices[0].message.content.strip()
-        except Exception as e:
-            answer = f"❌ Error: {e}"
+        # -------- translate w/ rules, streamed as it arrives --------
+        with st.chat_message("assistant"):
+            try:
+                answer = st.write_stream(translate_stream(src_text, tgt_lang))
+            except Exception as e:
+                answer = f"❌ Error: {e}"
+                st.markdown(answer)
 
         st.session_state.chat.append({"role": "assistant", "content": answer})
-        with st.chat_message("assistant"):
-            st.markdown(answer)
@@ -2,119 +2,531 @@
 """
 get_visible_text.py – Extract human‑visible text **with rich structural cues for LLMs**
 
-v8 – 2025‑06‑11
+v9 – 2026‑10‑15
 ---------------
-* **URL path now only last segment**: `/path1/path2/path3` → `#URL_PATH: /path3` (root “/” if none).
-* All prior features retained (bold tagged headings, bullet lists, link hash, header/footer stripped, `<main>` scope, etc.).
+* **lxml instead of BeautifulSoup**: one stack-based walk over the raw `lxml.etree` tree, dispatching on tag name and appending text fragments to a list joined once (was seven `find_all` sweeps plus `replace_with` edits).
+* **Caching**: HTTP responses go through a `requests_cache` session (15 min TTL, `.cache/ctx`); results for cached bodies are memoised by body hash (256 entries) and kept on disk by body hash (`diskcache`, 7 days, `.cache/text`).
+* **Layout levels**: `visible_text(url, layout="rich" | "basic" | "none")` – full cues, bullets only, or one line of text.
+* **selectolax (Lexbor) parser** when installed: one stack-based walk over the Lexbor tree emits the same text about twice as fast; lxml is the fallback.
+* **Batch API**: `visible_texts(urls)` (async) / `visible_texts_sync(urls)` fetch up to 50 pages at once over one HTTP/2 `httpx` client and parse them in worker threads.
+* **Worker pools**: `visible_text_many(urls)` spreads `visible_text` over a process pool (or threads with `processes=False`).
+* **Fast path**: `visible_text(url, fast=True)` returns trafilatura's Markdown of the main text when that package is installed, falling back to the walk when it finds none.
+* **Raw-byte parse**: the body is handed to the parser as bytes in the charset the `Content-Type` header names, else `<meta charset>`, else UTF‑8, else a guess cached per host (no decode to `str` first).
+* **Lazy imports**: requests, httpx, lxml, diskcache and asyncio load on first use, so `import get_visible_text` and `--help` take ~6 ms instead of ~280 ms.
+* All prior features retained (last‑segment URL path, bold tagged headings, bullet lists, link hash, header/footer stripped, `<main>` scope, etc.).
 
 CLI usage unchanged; `visible_text()` remains the public API.
 """
 
 from __future__ import annotations
 
-import argparse
-import pathlib
+import atexit
+import codecs
+import functools
+import hashlib
 import re
 import sys
-from typing import Final, Iterable
+import threading
+import warnings
+from typing import TYPE_CHECKING, Final, Iterable, Iterator, Literal, Mapping, get_args
 from urllib.parse import urlparse, unquote
 
-import requests
-from bs4 import BeautifulSoup
+if TYPE_CHECKING:
+    import diskcache
+    import httpx
+    import requests
+    import requests_cache
+    from lxml.etree import _Element as Element
+    from selectolax.lexbor import LexborHTMLParser, LexborNode
+    from types import ModuleType
+# requests, httpx, lxml, diskcache, asyncio and the optional parsers are imported
+# where first used (`_session`, `_text_cache`, `_lexbor`, `_trafilatura`, ...), so
+# importing this module, `--help` and each spawned pool worker start without them
+
+Layout = Literal["none", "basic", "rich"]
 
 USER_AGENT: Final = (
-    "Mozilla/5.0 (compatible; CleanTextBot/8.0; +https://github.com/Mjeezuz/clean-text-extractor)"
+    "Mozilla/5.0 (compatible; CleanTextBot/9.0; +https://github.com/Mjeezuz/clean-text-extractor)"
 )
 
+_HEADERS: Final = {"User-Agent": USER_AGENT, "Accept": "text/html,*/*;q=0.8"}
+
+CACHE_TTL: Final = 900  # seconds
+TEXT_CACHE_TTL: Final = 7 * 24 * 3600  # seconds; extracted text, keyed by body hash
+TEXT_FORMAT_VERSION: Final = 4  # part of that key: bump whenever the extracted text changes
+
+# frozensets: the walks test every element against these
+_DROP_TAGS: Final = frozenset((
+    "header", "footer", "script", "style", "noscript", "img", "svg", "iframe", "head", "title",
+    "meta", "link", "button", "input", "select", "option", "aside", "nav",
+))  # not "form": ASP.NET WebForms pages wrap the whole body in one
+_GAP_TAGS: Final = frozenset(("img", "svg", "iframe"))  # rendered as a box: leave a space, not glued text
+_STRIP_TAGS: Final = _DROP_TAGS - _GAP_TAGS
+_INLINE_TAGS: Final = frozenset(("b", "strong", "em", "i", "span"))  # folded into the surrounding text
+_HEADING_TAGS: Final = {"h1": 1, "h2": 2, "h3": 3, "h4": 4}
+_LEX_SKIP: Final = _STRIP_TAGS | {"-comment", None}  # None: processing instructions
+_WS: Final = re.compile(r"\s+")
+# whitespace runs that need rewriting: any run holding a \n, 2+ blanks, or one non-space blank
+_NORMALIZE_RE: Final = re.compile(r"[^\S\n]*\n\s*|[^\S\n]{2,}|[^\S \n]")
+# parse-time pruning: never build nodes the walk would discard anyway; dropped
+# elements (_STRIP_TAGS) are skipped unvisited by the walk, and <script> / <style>
+# bodies are not filtered out of the bytes: the tokenizer skips raw text far
+# faster than a regex can remove it (1 ms vs 6 ms on a 690 KB script-heavy page)
+# huge_tree: libxml2 otherwise stops at 256 levels of nesting and drops the rest;
+# with it the limit is 2048 (`_parse` warns when a page goes deeper)
+_PARSER_OPTIONS: Final = {
+    "remove_comments": True, "remove_pis": True, "collect_ids": False, "huge_tree": True,
+}
+_MAX_DEPTH: Final = 2048
+_BR_RE: Final = re.compile(rb"<br\b[^>]*>", re.IGNORECASE)
+_HEAD_END: Final = re.compile(rb"</head\s*>", re.IGNORECASE)
+_DESC_NAMES: Final = ("description", "og:description")  # <meta> names, by preference
+_HEADER_CHARSET: Final = re.compile(r"charset=[\"']?([\w.:-]+)", re.IGNORECASE)
+_META_CHARSET: Final = re.compile(rb"<meta[^>]+charset=[\"']?([\w.:-]+)", re.IGNORECASE)
+_CP1252_ALIASES: Final = frozenset(("ascii", "iso8859-1"))  # read as windows-1252 by browsers
+# a <meta> that could be read as ASCII cannot be UTF-16: browsers take UTF-8 instead
+_UTF16_CODECS: Final = frozenset(("utf-16", "utf-16-le", "utf-16-be"))
+
+@functools.cache
+def _session() -> requests_cache.CachedSession:
+    """Session shared by every call; revalidates with ETag / Last-Modified once an entry expires."""
+    import requests_cache
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    session = requests_cache.CachedSession(
+        ".cache/ctx", expire_after=CACHE_TTL, allowable_methods=("GET",)
+    )
+    session.headers.update(_HEADERS)
+    # Accept-Encoding is left to requests: it lists exactly what urllib3 can decode
+    # (gzip, deflate, plus br / zstd with the brotli / zstd extras installed)
+    # keep-alive pool per host, so repeated extractions skip the TCP + TLS handshake;
+    # transient errors are retried, and the last response still reaches raise_for_status();
+    # Retry-After is ignored: it may ask for hours, and that sleep is not bound by timeout
+    retry = Retry(
+        total=2, backoff_factor=0.2, status_forcelist=(429, 500, 502, 503, 504),
+        raise_on_status=False, respect_retry_after_header=False,
+    )
+    for prefix in ("https://", "http://"):
+        session.mount(prefix, HTTPAdapter(pool_connections=32, pool_maxsize=64, max_retries=retry))
+    atexit.register(session.close)
+    return session
+
+
+# extracted text per body, across runs: byte-identical pages (same body from
+# another URL, or after a restart) skip the parse; 256 MiB at most
+@functools.cache
+def _text_cache() -> diskcache.Cache:
+    """The on-disk text cache, opened on first use."""
+    import diskcache
+
+    cache = diskcache.Cache(".cache/text", size_limit=256 * 2**20)
+    atexit.register(cache.close)
+    return cache
+
+
+@functools.cache
+def _lexbor() -> type[LexborHTMLParser] | None:
+    """selectolax's Lexbor parser, the faster path; None when not installed (lxml then)."""
+    try:
+        from selectolax.lexbor import LexborHTMLParser
+    except ImportError:  # pragma: no cover
+        return None
+    return LexborHTMLParser
+
+
+@functools.cache
+def _trafilatura() -> ModuleType | None:
+    """The trafilatura package for ``fast=True``; None when not installed."""
+    try:
+        import trafilatura
+    except ImportError:  # pragma: no cover – also raised when lxml_html_clean is missing
+        return None
+    return trafilatura
+
+# the three in-memory caches below are shared by worker threads (Streamlit's pool,
+# asyncio.to_thread, visible_text_many): every read and write goes through
+# _lru_get / _lru_put under this lock
+_LRU_LOCK: Final = threading.Lock()
+
+# async path (no requests_cache there): (url, layout) -> (ETag, Last-Modified, text),
+# so an unchanged page costs one 304 and no parse; oldest entries go first
+_ETAG_CACHE: Final[dict[tuple[str, str], tuple[str | None, str | None, str]]] = {}
+_ETAG_CACHE_SIZE: Final = 256
+
+# in-memory layer over _text_cache: extraction key -> result, oldest first; keyed
+# by the body hash, so no page body is kept alive by the memo
+_TEXT_MEMO: Final[dict[str, tuple[str, str, str] | None]] = {}
+_TEXT_MEMO_SIZE: Final = 256
+_MISS: Final = object()  # a memoised None is a hit: trafilatura found no main text
+
+# host -> encoding detected for its pages that declare none and are not UTF‑8:
+# a site serves one legacy encoding, so detection runs once per host; only
+# confident guesses are kept (a few bytes of "café" fit a dozen code pages)
+_ENC_CACHE: Final[dict[str, str]] = {}
+_ENC_CACHE_SIZE: Final = 1024
+_ENC_MIN_BODY: Final = 16 * 1024  # a guess from this much text is kept regardless
+
 # ---------------------------------------------------------------------------
 # Helper functions
 # ---------------------------------------------------------------------------
 
-def _first_meta_content(soup: BeautifulSoup, names: Iterable[str]) -> str:
-    """Return the first <meta name="..." content="..."> that matches *names*."""
-    for nm in names:
-        tag = soup.find("meta", attrs={"name": nm})
-        if tag and (content := tag.get("content")):
-            return content.strip()
-    return ""
+def _first_meta_content(metas: Iterable[Mapping[str, str | None]], names: Iterable[str]) -> str:
+    """Return the content of the <meta> that matches the earliest of *names*.
+
+    *metas* are the attributes of each <meta>, read in one pass; a tag matches on
+    ``name`` or ``property`` (``og:*`` tags use the latter), case-insensitively.
+    """
+    found: dict[str, str] = {}
+    for attrs in metas:
+        if content := (attrs.get("content") or "").strip():
+            for key in (attrs.get("name"), attrs.get("property")):
+                if key:
+                    found.setdefault(key.lower(), content)
+    return next((found[nm] for nm in names if nm in found), "")
+
+
+def _lru_get(cache: dict, key: object, default: object = None) -> object:
+    """Return the entry of *cache* for *key*, or *default*."""
+    with _LRU_LOCK:
+        return cache.get(key, default)
+
+
+def _lru_put(cache: dict, size: int, key: object, value: object) -> None:
+    """Store *value* as the newest entry of *cache*, dropping the oldest beyond *size*."""
+    with _LRU_LOCK:
+        cache.pop(key, None)  # re-insert as the newest
+        if len(cache) >= size:
+            del cache[next(iter(cache))]
+        cache[key] = value
+
+
+def _body_hash(body: bytes) -> str:
+    return hashlib.blake2b(body, digest_size=16).hexdigest()
+
+
+def _header_charset(resp: requests.Response) -> str | None:
+    """Return the charset declared in the Content-Type header, if any."""
+    m = _HEADER_CHARSET.search(resp.headers.get("Content-Type", ""))
+    return m.group(1) if m else None
+
+
+def _codec(charset: str) -> str | None:
+    """Return Python's name for the text encoding labelled *charset*, or None if unknown.
+
+    As in browsers, ASCII and Latin‑1 labels mean windows‑1252 (which adds €, “ ” …).
+    """
+    try:
+        b"<".decode(charset, "replace")  # rejects unknown labels and bytes-to-bytes codecs alike
+    except LookupError:
+        return None
+    name = codecs.lookup(charset).name
+    return "cp1252" if name in _CP1252_ALIASES else name
+
+
+def _sniff_codec(charset: str | None, head: bytes) -> str | None:
+    """Return the codec for a body starting with *head*: *charset*, else its `<meta charset>`.
+
+    Like a browser, only the first KiB is scanned; unknown labels are skipped.
+    """
+    codec = _codec(charset) if charset else None
+    if codec is None and (m := _META_CHARSET.search(head, 0, 1024)):
+        codec = _codec(m.group(1).decode("ascii"))
+        if codec in _UTF16_CODECS:
+            codec = "utf-8"
+    return codec
+
+
+def _body_charset(url: str, body: bytes, charset: str | None) -> str | None:
+    """Return *charset*, or a detected one if *body* declares none and is not UTF‑8.
+
+    Detection (`charset_normalizer`, pure Python) is cached per host in `_ENC_CACHE`
+    when the guess is confident.
+    """
+    if _sniff_codec(charset, body) is not None:
+        return charset
+    try:
+        body.decode("utf-8")  # also ASCII: what we assume anyway
+        return charset
+    except UnicodeDecodeError:
+        pass
+    host = urlparse(url).netloc
+    if (encoding := _lru_get(_ENC_CACHE, host)) is not None:
+        return encoding
+    import charset_normalizer
+
+    if (match := charset_normalizer.from_bytes(body).best()) is None:
+        return charset  # not text at all
+    if len(body) >= _ENC_MIN_BODY or (match.coherence >= 0.5 and match.chaos <= 0.1):
+        _lru_put(_ENC_CACHE, _ENC_CACHE_SIZE, host, match.encoding)
+    return match.encoding
+
+
+def _parse(body: bytes, charset: str | None = None) -> Element:
+    """Parse the raw HTML *body* with lxml and return the document root.
+
+    Without a *charset* the first KiB is scanned for `<meta charset>`, like a
+    browser would; UTF‑8 is assumed if there is none, or if the label is unknown.
+    """
+    from lxml import etree
+
+    codec = _sniff_codec(charset, body) or "utf-8"
+    # plain HTMLParser, not HTMLPullParser: no event queue, about half the cost
+    # (even one limited to tag="main", to stop at </main>, only pays off when most
+    # of the page follows </main>: 4.6 vs 3.1 ms on a 100 KB page with a short tail);
+    # no lxml.html class lookup either: plain etree elements are cheaper to proxy
+    try:
+        parser = etree.HTMLParser(encoding=codec, **_PARSER_OPTIONS)
+    except LookupError:  # known to Python, not to libxml2 (e.g. euc_jp, utf-16-le)
+        parser = etree.HTMLParser(encoding="utf-8", **_PARSER_OPTIONS)
+        body = body.decode(codec, errors="replace").encode("utf-8")
+    # every <br> becomes a literal newline; fromstring, not feed(): close() drops the error log
+    root = etree.fromstring(_BR_RE.sub(b"\n", body), parser)
+    if any(e.type == etree.ErrorTypes.ERR_RESOURCE_LIMIT for e in parser.error_log):
+        warnings.warn(
+            f"HTML nested deeper than {_MAX_DEPTH} elements; the text after that point is lost",
+            stacklevel=2,
+        )
+    return root if root is not None else etree.Element("html")  # empty body
+
+
+# ---------------------------------------------------------------------------
+# Layout transform
+# ---------------------------------------------------------------------------
+
+# one format per tag and layout, shared by the lxml and Lexbor walkers;
+# "{}" receives the element's text flattened onto one line, and the outer
+# spaces keep the cue apart from its neighbours (one string per element)
+_BASIC: Final[dict[str, str]] = {"li": " - {}\n "}
+
+_RICH: Final[dict[str, str]] = {
+    **_BASIC,
+    "a": " #{} ",
+    "p": " {}\n\n ",
+    **{tag: f" \n\n**[H{level}] {{}}**\n\n " for tag, level in _HEADING_TAGS.items()},
+}
+
+_FORMATS: Final[dict[str, dict[str, str]]] = {"none": {}, "basic": _BASIC, "rich": _RICH}
+
+# Both walks dispatch on the tag inline: one `formats.get` then frozenset tests.
+# A table of per-tag handler functions was measured ~20% slower (one call per element).
+# Both are depth-first with an explicit stack, not recursion, so deep pages cannot
+# hit RecursionError: one frame per open element. A flattened element collects into
+# a list of its own, and *nested* marks one inside another: it is only trimmed, the
+# whitespace is collapsed once by the outermost flattened element.
+
+
+def _walk(el: Element, formats: dict[str, str], out: list[str]) -> None:
+    """Append the text below *el* to *out* with layout cues; the tree is never modified."""
+    # frame: (its siblings still to visit, nested, closing string or format,
+    # outer list or None, its tail)
+    stack: list[tuple[Iterator[Element], bool, str | None, list[str] | None, str | None]] = []
+    children, nested = iter(el), False
+    if el.text:
+        out.append(el.text)
+    while True:
+        for child in children:
+            tag = child.tag
+            if (fmt := formats.get(tag)) is not None:  # flattened onto one line
+                stack.append((children, nested, fmt, out, child.tail))
+                out, nested = [], True
+            elif tag in _INLINE_TAGS:  # folded into the surrounding text
+                stack.append((children, nested, None, None, child.tail))
+            elif tag not in _DROP_TAGS:  # a block: keep its boundaries apart
+                out.append(" ")
+                stack.append((children, nested, " ", None, child.tail))
+            else:
+                if tag in _GAP_TAGS:
+                    out.append(" ")
+                if child.tail:  # also for dropped elements: the tail is outside them
+                    out.append(child.tail)
+                continue
+            if child.text:
+                out.append(child.text)
+            children = iter(child)
+            break
+        else:  # all children done: close the element they belong to
+            if not stack:
+                return
+            children, nested, close, outer, tail = stack.pop()
+            if outer is not None:
+                text = "".join(out)
+                out = outer
+                out.append(close.format(text.strip() if nested else " ".join(text.split())))
+            elif close is not None:
+                out.append(close)
+            if tail:
+                out.append(tail)
+
+
+def _lex_walk(node: LexborNode, formats: dict[str, str], out: list[str]) -> None:
+    """Append the text below *node* to *out* with layout cues (Lexbor twin of `_walk`)."""
+    # frame: (next sibling, nested, closing string or format, outer list or None)
+    stack: list[tuple[LexborNode | None, bool, str | None, list[str] | None]] = []
+    child, nested = node.child, False
+    while True:
+        while child is not None:
+            tag = child.tag
+            if tag == "-text":
+                out.append(child.text_content or "")
+            elif (fmt := formats.get(tag)) is not None:  # flattened onto one line
+                stack.append((child.next, nested, fmt, out))
+                out = []
+                child, nested = child.child, True
+                continue
+            elif tag in _GAP_TAGS:
+                out.append(" ")
+            elif tag == "br":
+                out.append("\n")
+            elif tag in _INLINE_TAGS:  # folded into the surrounding text
+                stack.append((child.next, nested, None, None))
+                child = child.child
+                continue
+            elif tag not in _LEX_SKIP:  # a block: keep its boundaries apart
+                out.append(" ")
+                stack.append((child.next, nested, " ", None))
+                child = child.child
+                continue
+            child = child.next
+        if not stack:
+            return
+        child, nested, close, outer = stack.pop()
+        if outer is not None:
+            text = "".join(out)
+            out = outer
+            out.append(close.format(text.strip() if nested else " ".join(text.split())))
+        elif close is not None:
+            out.append(close)
 
 # ---------------------------------------------------------------------------
 # Public API
 # ---------------------------------------------------------------------------
 
-def visible_text(url: str, timeout: int = 20) -> str:
-    """Return only the human‑visible text at *url* with layout cues and a header."""
+def _norm(m: re.Match[str]) -> str:
+    """A whitespace run becomes one space, one newline, or one blank line."""
+    newlines = m.group().count("\n")
+    return " " if not newlines else "\n" if newlines == 1 else "\n\n"
+
+
+def _normalise(raw: str, layout: Layout) -> str:
+    """Collapse the whitespace of *raw*: one line for ``"none"``, else at most one blank line."""
+    if layout == "none":
+        return _WS.sub(" ", raw).strip()
+    return _NORMALIZE_RE.sub(_norm, raw).strip()  # one pass; single spaces never hit _norm
 
-    # 1 — fetch -------------------------------------------------------------
-    resp = requests.get(url, timeout=timeout, headers={"User-Agent": USER_AGENT})
-    resp.raise_for_status()
 
-    # 2 — parse full document ----------------------------------------------
-    soup_full = BeautifulSoup(resp.text, "lxml")
+def _extract(root: Element, layout: Layout) -> tuple[str, str, str]:
+    """Return ``(title, meta description, cleaned body)`` for a parsed document."""
 
-    # 3a — collect meta data ----------------------------------------------
-    title_txt = soup_full.title.string.strip() if soup_full.title and soup_full.title.string else ""
-    meta_desc = _first_meta_content(soup_full, ("description", "og:description"))
+    # 3a — collect meta data ----------------------------------------------
+    head = root.find("head")  # both live in <head>: no need to scan the whole body
+    if head is None:
+        head = root
+    # a stray <title> or <meta> in <body> still counts
+    title_txt = (head.findtext(".//title") or root.findtext(".//title", "")).strip()
+    meta_desc = _first_meta_content((tag.attrib for tag in head.iter("meta")), _DESC_NAMES)
+    if not meta_desc and head is not root:
+        meta_desc = _first_meta_content((tag.attrib for tag in root.iter("meta")), _DESC_NAMES)
 
+    # 3b — isolate <main> or <body> ----------------------------------------
+    main = root.find(".//main")
+    if main is None:
+        main = root.find("body")
+    if main is None:
+        main = root  # <head> is skipped by the walk
+
+    # 4–9 — drop blocks, mark links / headings / lists / paragraphs ---------
+    out: list[str] = []
+    _walk(main, _FORMATS[layout], out)
+
+    # 10 — extract, normalise whitespace -----------------------------------
+    raw = "".join(out)  # one join for the whole page
+    return title_txt, meta_desc, _normalise(raw, layout)
+
+
+def _extract_lexbor(body: bytes, charset: str | None, layout: Layout) -> tuple[str, str, str]:
+    """`_extract` on selectolax's Lexbor parser: same output, about twice as fast."""
+    LexborHTMLParser = _lexbor()
+    codec = _sniff_codec(charset, body)  # same rules as _parse (Lexbor's own reads latin-1 as ISO)
+    if codec is None:  # nothing declared, or an unknown label
+        tree = LexborHTMLParser(body, encoding=True)  # BOM, else UTF‑8
+    elif codec == "utf-8":
+        tree = LexborHTMLParser(body)  # Lexbor's native encoding: no decode at all
+    else:
+        tree = LexborHTMLParser(body.decode(codec, errors="replace"))
+
+    # as in _extract: <head> first, then the whole tree; Lexbor closes <head> early at
+    # the first element that does not belong there (e.g. <img> in a tracking <noscript>),
+    # and everything after it lands in <body>
+    head = tree.head or tree.root
+    title = head.css_first("title") or tree.css_first("title")
+    title_txt = title.text(strip=True) if title is not None else ""
+    meta_desc = _first_meta_content((tag.attributes for tag in head.css("meta")), _DESC_NAMES)
+    if not meta_desc and tree.head is not None:
+        meta_desc = _first_meta_content((tag.attributes for tag in tree.css("meta")), _DESC_NAMES)
+
+    main = tree.css_first("main") or tree.body or tree.root
+    if main is None:  # empty body
+        return title_txt, meta_desc, ""
+    out: list[str] = []
+    _lex_walk(main, _FORMATS[layout], out)  # "none" too: inline tags must not split words
+    raw = "".join(out)
+    return title_txt, meta_desc, _normalise(raw, layout)
+
+
+def _extract_body(body: bytes, charset: str | None, layout: Layout) -> tuple[str, str, str]:
+    """`_extract` for a body that is already in memory, memoised by body hash.
+
+    Results live in `_TEXT_MEMO`, backed by `_text_cache` on disk.
+    """
+    key = f"v{TEXT_FORMAT_VERSION}:{layout}:{charset}:{_body_hash(body)}"
+    if (parts := _lru_get(_TEXT_MEMO, key)) is None and (parts := _text_cache().get(key)) is None:
+        if _lexbor() is not None:
+            parts = _extract_lexbor(body, charset, layout)
+        else:
+            parts = _extract(_parse(body, charset), layout)
+        _text_cache().set(key, parts, expire=TEXT_CACHE_TTL)
+    _lru_put(_TEXT_MEMO, _TEXT_MEMO_SIZE, key, parts)
+    return parts
+
+
+def _extract_fast(body: bytes, charset: str | None, url: str) -> tuple[str, str, str] | None:
+    """Main text of *body* as Markdown via trafilatura, or None if it finds none.
+
+    Title and meta description still come from our own ``<head>`` lookup.
+    Memoised by body hash in `_TEXT_MEMO`, misses included.
+    """
+    if (trafilatura := _trafilatura()) is None:
+        return None
+    key = f"fast:{charset}:{url}:{_body_hash(body)}"
+    if (parts := _lru_get(_TEXT_MEMO, key, _MISS)) is not _MISS:
+        return parts
+    codec = _sniff_codec(charset, body)  # as for the walk; else trafilatura guesses itself
+    text = trafilatura.extract(
+        body.decode(codec, errors="replace") if codec else body,
+        url=url, include_links=True, include_formatting=True,
+        output_format="markdown", favor_precision=False,
+    )
+    parts = None
+    if text is not None:
+        # only the header fields: parse up to </head>, not the whole page
+        head = body[: m.end()] if (m := _HEAD_END.search(body)) else body
+        if _lexbor() is not None:
+            title_txt, meta_desc, _ = _extract_lexbor(head, charset, "none")
+        else:
+            title_txt, meta_desc, _ = _extract(_parse(head, charset), "none")
+        parts = title_txt, meta_desc, text
+    _lru_put(_TEXT_MEMO, _TEXT_MEMO_SIZE, key, parts)
+    return parts
+
+
+def _with_header(url: str, title_txt: str, meta_desc: str, cleaned: str) -> str:
+    """Prepend the ``#URL_PATH`` / ``#TITLE`` / ``#META_DESC`` header to *cleaned*."""
     parsed = urlparse(url)
     segments = [s for s in parsed.path.split("/") if s]
     last_segment = segments[-1] if segments else ""
     path_id = f"/{unquote(last_segment)}" if last_segment else "/"
 
-    # 3b — isolate <main> or <body> ----------------------------------------
-    main = soup_full.find("main") or soup_full.body or soup_full
-    soup = BeautifulSoup(str(main), "lxml")  # operate on a copy
-
-    # 4 — drop unwanted blocks ---------------------------------------------
-    for tag in soup.find_all(
-        [
-            "header",
-            "footer",
-            "script",
-            "style",
-            "noscript",
-            "img",
-            "svg",
-            "iframe",
-            "head",
-            "title",
-        ]
-    ):
-        tag.decompose()
-
-    # 5 — mark links --------------------------------------------------------
-    for a in soup.find_all("a"):
-        a_text = a.get_text(" ", strip=True)
-        a.replace_with(f"#{a_text}")
-
-    # 6 — convert headings --------------------------------------------------
-    for level in range(1, 5):
-        for h in soup.find_all(f"h{level}"):
-            text_h = h.get_text(" ", strip=True)
-            h.replace_with(f"\n\n**[H{level}] {text_h}**\n\n")
-
-    # 7 — bullet lists ------------------------------------------------------
-    for li in soup.find_all("li"):
-        li_text = li.get_text(" ", strip=True)
-        li.replace_with(f"- {li_text}\n")
-
-    # 8 — paragraphs --------------------------------------------------------
-    for p in soup.find_all("p"):
-        p_text = p.get_text(" ", strip=True)
-        p.replace_with(f"{p_text}\n\n")
-
-    # 9 — <BR> to newline ---------------------------------------------------
-    for br in soup.find_all("br"):
-        br.replace_with("\n")
-
-    # 10 — extract, normalise whitespace -----------------------------------
-    raw = soup.get_text(separator=" ")  # use space to avoid inline \n breaks
-
-    lines = [re.sub(r"\s+", " ", ln).rstrip() for ln in raw.splitlines()]
-    joined = "\n".join(ln for ln in lines)
-    cleaned = re.sub(r"\n{3,}", "\n\n", joined).strip()
-
-    # 11 — prepend header ---------------------------------------------------
     header_parts = [f"#URL_PATH: {path_id}"]
     if title_txt:
         header_parts.append(f"#TITLE: {title_txt}")
@@ -124,18 +536,188 @@ def visible_text(url: str, timeout: int = 20) -> str:
 
     return f"{header}\n\n{cleaned}"
 
+
+def _check_layout(layout: str) -> None:
+    if layout not in get_args(Layout):
+        raise ValueError(f"layout must be one of {get_args(Layout)}, not {layout!r}")
+
+
+def visible_text_from_html(
+    html: bytes,
+    url: str,
+    *,
+    layout: Layout = "rich",
+    charset: str | None = None,
+    fast: bool = False,
+) -> str:
+    """Like `visible_text` for a page that is already downloaded.
+
+    *url* feeds the header and the per-host charset guess; *charset* is the one
+    declared by the server, if any.
+    """
+    _check_layout(layout)
+    charset = _body_charset(url, html, charset)
+    parts = _extract_fast(html, charset, url) if fast else None
+    return _with_header(url, *(parts or _extract_body(html, charset, layout)))
+
+
+def visible_text(
+    url: str, timeout: int = 20, *, layout: Layout = "rich", fast: bool = False
+) -> str:
+    """Return only the human‑visible text at *url* with layout cues and a header.
+
+    *layout* picks the cues: ``"rich"`` (headings, links, bullets, paragraphs),
+    ``"basic"`` (bullets only) or ``"none"`` – a single line of text.
+    *fast* hands the body to trafilatura (Markdown, *layout* ignored) when it is
+    installed; pages it finds no main text in go through the usual pipeline.
+    """
+    _check_layout(layout)
+
+    # 1–10 — fetch, parse and transform ------------------------------------
+    with _session().get(url, timeout=timeout) as resp:
+        resp.raise_for_status()
+        body = resp.content
+        charset = _body_charset(url, body, _header_charset(resp))
+    parts = _extract_fast(body, charset, url) if fast else None
+    parts = parts or _extract_body(body, charset, layout)  # memoised
+
+    # 11 — prepend header ---------------------------------------------------
+    return _with_header(url, *parts)
+
+
+async def visible_text_async(
+    url: str, client: httpx.AsyncClient, timeout: int = 20, *, layout: Layout = "rich"
+) -> str:
+    """`visible_text` over a shared *client*; the parse runs in a worker thread.
+
+    Unlike `visible_text` this does not go through the on-disk HTTP cache; instead
+    pages seen before are revalidated with a conditional GET (ETag / Last-Modified).
+    """
+    import asyncio
+
+    _check_layout(layout)
+    key = (url, layout)
+    headers = {}
+    if (hit := _lru_get(_ETAG_CACHE, key)) is not None:
+        etag, modified, text = hit
+        if etag:
+            headers["If-None-Match"] = etag
+        if modified:
+            headers["If-Modified-Since"] = modified
+
+    resp = await client.get(url, timeout=timeout, headers=headers)
+    if resp.status_code == 304 and hit is not None:
+        return text
+    resp.raise_for_status()
+    text = await asyncio.to_thread(
+        visible_text_from_html, resp.content, url, layout=layout, charset=resp.charset_encoding
+    )
+
+    etag, modified = resp.headers.get("ETag"), resp.headers.get("Last-Modified")
+    if etag or modified:
+        _lru_put(_ETAG_CACHE, _ETAG_CACHE_SIZE, key, (etag, modified, text))
+    return text
+
+
+async def visible_texts(
+    urls: Iterable[str], concurrency: int = 50, timeout: int = 20, *, layout: Layout = "rich"
+) -> list[str | Exception]:
+    """Extract many pages concurrently, at most *concurrency* in flight.
+
+    Each page gets *timeout* seconds in all, once it is in flight. Results come back
+    in the order of *urls*; a page that fails (or times out) yields its exception.
+    """
+    import asyncio
+
+    import httpx
+
+    sem = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(max_connections=64, max_keepalive_connections=32)
+
+    async with httpx.AsyncClient(
+        http2=True, limits=limits, follow_redirects=True, headers=_HEADERS
+    ) as client:
+
+        async def one(url: str) -> str:
+            async with sem:
+                try:  # httpx's timeout is per network operation, not per page
+                    return await asyncio.wait_for(
+                        visible_text_async(url, client, timeout, layout=layout), timeout
+                    )
+                except TimeoutError:
+                    raise TimeoutError(f"no response within {timeout} s") from None
+
+        return await asyncio.gather(*(one(u) for u in urls), return_exceptions=True)
+
+
+def visible_texts_sync(
+    urls: Iterable[str], concurrency: int = 50, timeout: int = 20, *, layout: Layout = "rich"
+) -> list[str | Exception]:
+    """Blocking `visible_texts`, for callers without an event loop."""
+    import asyncio
+
+    return asyncio.run(visible_texts(urls, concurrency, timeout, layout=layout))
+
+
+def _visible_text_or_error(url: str, timeout: int, layout: Layout) -> str | Exception:
+    try:
+        return visible_text(url, timeout, layout=layout)
+    except Exception as e:  # returned, not raised: one bad page must not sink the batch
+        return e
+
+
+def visible_text_many(
+    urls: Iterable[str],
+    workers: int | None = None,
+    timeout: int = 20,
+    *,
+    layout: Layout = "rich",
+    processes: bool = True,
+) -> list[str | Exception]:
+    """Run `visible_text` over *urls* in a pool of *workers* processes (or threads).
+
+    Processes spread the CPU-bound parsing over all cores; ``processes=False``
+    uses threads, enough when fetching dominates. Results come back in the order
+    of *urls*; a page that fails yields its exception.
+    """
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+    _check_layout(layout)
+    job = functools.partial(_visible_text_or_error, timeout=timeout, layout=layout)
+    if processes:
+        # spawn, not fork: a child must not inherit the parent's SQLite handles and sockets
+        pool = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"))
+    else:
+        pool = ThreadPoolExecutor(workers)
+    with pool:
+        # one URL per task: a page is a whole fetch, so batching saves nothing and a
+        # batch of 8 would leave short lists on one or two workers
+        return list(pool.map(job, urls, chunksize=1))
+
 # ---------------------------------------------------------------------------
 # CLI helper
 # ---------------------------------------------------------------------------
 
 def _cli() -> None:  # pragma: no cover
+    import argparse
+    import pathlib
+
     p = argparse.ArgumentParser(description="Extract visible text with layout cues.")
     p.add_argument("url", help="Web page URL to fetch")
     p.add_argument("-o", "--output", metavar="FILE", help="Write to FILE instead of stdout")
     p.add_argument("-t", "--timeout", type=int, default=20, help="HTTP timeout seconds")
+    p.add_argument(
+        "-l", "--layout", choices=get_args(Layout), default="rich",
+        help="Layout cues: rich (default), basic (bullets only) or none (fastest)",
+    )
+    p.add_argument(
+        "-f", "--fast", action="store_true",
+        help="Use trafilatura for the main text when installed (Markdown, ignores --layout)",
+    )
     args = p.parse_args()
 
-    txt = visible_text(args.url, timeout=args.timeout)
+    txt = visible_text(args.url, timeout=args.timeout, layout=args.layout, fast=args.fast)
     if args.output:
         path = pathlib.Path(args.output)
         path.write_text(txt, encoding="utf-8")
@@ -0,0 +1,25 @@
+import diskcache
+import pytest
+
+import get_visible_text as gvt
+
+
+@pytest.fixture(autouse=True)
+def cold_caches(tmp_path, monkeypatch):
+    """Every test starts with empty memos and its own on-disk text cache."""
+    cache = diskcache.Cache(tmp_path / "text")
+    monkeypatch.setattr(gvt, "_text_cache", lambda: cache)
+    for memo in (gvt._TEXT_MEMO, gvt._ETAG_CACHE, gvt._ENC_CACHE):
+        memo.clear()
+    yield
+    cache.close()
+
+
+@pytest.fixture(params=["lexbor", "lxml"])
+def backend(request, monkeypatch):
+    """Run the test once per parser."""
+    if request.param == "lxml":
+        monkeypatch.setattr(gvt, "_lexbor", lambda: None)
+    elif gvt._lexbor() is None:
+        pytest.skip("selectolax is not installed")
+    return request.param
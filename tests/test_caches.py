@@ -0,0 +1,33 @@
+import threading
+
+import get_visible_text as gvt
+
+
+def test_lru_put_from_many_threads():
+    cache: dict[int, int] = {}
+    errors: list[BaseException] = []
+
+    def fill(offset: int) -> None:
+        try:
+            for i in range(20_000):
+                gvt._lru_put(cache, 256, offset + i, i)
+        except BaseException as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=fill, args=(n * 100_000,)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    assert len(cache) == 256
+
+
+def test_lru_put_drops_the_oldest():
+    cache: dict[str, int] = {}
+    for key in "abc":
+        gvt._lru_put(cache, 2, key, 0)
+    gvt._lru_put(cache, 2, "b", 1)  # refreshed: now the newest
+    gvt._lru_put(cache, 2, "d", 0)
+    assert list(cache) == ["b", "d"]
@@ -0,0 +1,73 @@
+import pytest
+
+import get_visible_text as gvt
+
+NORDIC = "Søndag på fjorden – «café» for 5 €"
+
+# (label, codec the page is written in, text)
+CASES = [
+    ("utf-8", "utf-8", NORDIC),
+    ("windows-1252", "cp1252", NORDIC),
+    ("latin-1", "cp1252", NORDIC),  # browsers read Latin-1 labels as windows-1252
+    ("iso-8859-15", "iso8859-15", "Søndag på fjorden, 5 €"),
+    ("koi8-r", "koi8-r", "Воскресенье на фьорде"),
+    ("euc-jp", "euc-jp", "フィヨルドの日曜日"),  # libxml2 lacks it: transcoded first
+]
+
+
+def page(text: str, meta: str = "") -> str:
+    return f"<html><head>{meta}<title>T</title></head><body><p>{text}</p></body></html>"
+
+
+def body_text(html: bytes, charset: str | None = None) -> str:
+    return gvt.visible_text_from_html(html, "http://example.com/", layout="none", charset=charset)
+
+
+@pytest.mark.parametrize("label, codec, text", CASES)
+def test_header_charset(backend, label, codec, text):
+    assert body_text(page(text).encode(codec), charset=label).endswith(text)
+
+
+@pytest.mark.parametrize("label, codec, text", CASES)
+def test_meta_charset(backend, label, codec, text):
+    html = page(text, f'<meta charset="{label}">').encode(codec)
+    assert body_text(html).endswith(text)
+
+
+def test_unknown_header_label_falls_back_to_meta(backend):
+    html = page(NORDIC, '<meta charset="windows-1252">').encode("cp1252")
+    assert body_text(html, charset="x-bogus").endswith(NORDIC)
+
+
+@pytest.mark.parametrize("label", ["utf-16", "UTF-16LE", "utf-16be"])
+def test_meta_utf16_means_utf8(backend, label):
+    html = page(NORDIC, f'<meta charset="{label}">').encode("utf-8")
+    assert body_text(html).endswith(NORDIC)
+
+
+PROSE = (
+    "Ærlig talt, søndag på fjorden – «café» med utsikt over havet og båtene. "
+    "Vi seilte langs kysten i tre dager, forbi små øyer og høye fjell."
+)
+
+
+def test_undeclared_legacy_page_is_detected(backend):
+    html = page(PROSE).encode("cp1252")
+    assert body_text(html).endswith(PROSE)
+
+
+def test_only_confident_guesses_are_kept_per_host():
+    gvt._body_charset("http://short.example/a", "<p>café…</p>".encode("cp1252"), None)
+    assert "short.example" not in gvt._ENC_CACHE
+
+    html = page(PROSE).encode("cp1252")
+    assert gvt._body_charset("http://prose.example/a", html, None) == "cp1252"
+    assert gvt._ENC_CACHE["prose.example"] == "cp1252"
+
+
+def test_host_guesses_are_capped(monkeypatch):
+    monkeypatch.setattr(gvt, "_ENC_CACHE_SIZE", 2)
+    html = page(PROSE).encode("cp1252")
+    for host in ("a", "b", "c"):
+        gvt._body_charset(f"http://{host}.example/", html, None)
+    assert list(gvt._ENC_CACHE) == ["b.example", "c.example"]
@@ -0,0 +1,51 @@
+import asyncio
+
+import httpx
+
+import get_visible_text as gvt
+
+URL = "http://example.com/page"
+
+
+def serve(pages: list[tuple[str, bytes]], seen: list[str | None]):
+    """Answer with the next (ETag, body) of *pages*, or 304 while the ETag still matches."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        etag, body = pages[0] if len(pages) == 1 else pages.pop(0)
+        seen.append(request.headers.get("If-None-Match"))
+        if request.headers.get("If-None-Match") == etag:
+            return httpx.Response(304, headers={"ETag": etag})
+        return httpx.Response(200, headers={"ETag": etag}, content=body)
+
+    return httpx.MockTransport(handler)
+
+
+def fetch(transport: httpx.MockTransport, times: int) -> list[str]:
+    async def run():
+        async with httpx.AsyncClient(transport=transport) as client:
+            return [await gvt.visible_text_async(URL, client) for _ in range(times)]
+
+    return asyncio.run(run())
+
+
+def test_unchanged_page_costs_a_304_and_no_parse(monkeypatch):
+    parses = []
+    parse = gvt.visible_text_from_html
+    monkeypatch.setattr(gvt, "visible_text_from_html", lambda *a, **k: parses.append(1) or parse(*a, **k))
+    seen: list[str | None] = []
+
+    first, second = fetch(serve([('"v1"', b"<p>hello</p>")], seen), 2)
+
+    assert first == second and first.endswith("hello")
+    assert seen == [None, '"v1"']
+    assert len(parses) == 1
+
+
+def test_changed_page_is_parsed_again():
+    seen: list[str | None] = []
+    pages = [('"v1"', b"<p>old</p>"), ('"v2"', b"<p>new</p>")]
+
+    first, second = fetch(serve(pages, seen), 2)
+
+    assert first.endswith("old") and second.endswith("new")
+    assert seen == [None, '"v1"']
@@ -0,0 +1,77 @@
+import pytest
+
+import get_visible_text as gvt
+
+URL = "http://example.com/trips/fjord"
+
+# Lexbor closes <head> at the <img>: the <title> and <meta> after it end up in <body>
+PIXEL_HEAD = (
+    b"<html><head><script>x</script><noscript><img src=x></noscript>"
+    b'<title>Real</title><meta name="description" content="Desc"></head>'
+    b"<body><p>Body</p></body></html>"
+)
+
+
+def test_meta_after_early_head_close(backend):
+    assert gvt.visible_text_from_html(PIXEL_HEAD, URL) == (
+        "#URL_PATH: /fjord\n#TITLE: Real\n#META_DESC: Desc\n\nBody"
+    )
+
+
+def test_fast_path_header_after_early_head_close(backend):
+    if gvt._trafilatura() is None:
+        pytest.skip("trafilatura is not installed")
+    text = gvt.visible_text_from_html(PIXEL_HEAD, URL, fast=True)
+    assert text.startswith("#URL_PATH: /fjord\n#TITLE: Real\n#META_DESC: Desc\n\n")
+
+
+def deep_page(depth: int) -> bytes:
+    return b"<html><body>" + b"<font>" * depth + b"deep" + b"</font>" * depth + b"<p>tail</p></body></html>"
+
+
+def test_deep_nesting_is_walked(backend):
+    assert gvt.visible_text_from_html(deep_page(2000), URL, layout="none").endswith("deep tail")
+
+
+def test_nesting_past_the_libxml2_limit_warns(monkeypatch):
+    monkeypatch.setattr(gvt, "_lexbor", lambda: None)
+    with pytest.warns(UserWarning, match="deeper than 2048"):
+        gvt.visible_text_from_html(deep_page(3000), URL, layout="none")
+
+
+# og:description via property=; header, nav, footer, script and button dropped;
+# <img> leaves a gap; <form> kept; nested <li> / <a> flattened into the outer <li>
+SAMPLE = (
+    b"<html><head><title>Fjord</title>"
+    b'<meta property="og:description" content="Boats and fjords"></head><body>'
+    b"<header>Site header</header><nav><a href=/>Home</a></nav>"
+    b"<main><h1>Trips</h1>"
+    b"<p>Sail the <b>fjord</b>,<br>then rest.</p>"
+    b"<ul><li>Day <a href=/1>one\n   trip</a></li>"
+    b"<li>Day two<ul><li>inner  <a href=/x>link</a></li></ul></li></ul>"
+    b"<p>Photo<img src=x>caption<script>var x=1</script><button>Buy</button> end</p>"
+    b"<form><label>Name</label><input name=n><p>Form text</p></form>"
+    b"</main><footer>Footer</footer></body></html>"
+)
+SAMPLE_HEADER = "#URL_PATH: /fjord\n#TITLE: Fjord\n#META_DESC: Boats and fjords\n\n"
+
+
+@pytest.mark.parametrize("layout, text", [
+    (
+        "rich",
+        "**[H1] Trips**\n\nSail the fjord, then rest.\n\n- Day #one trip\n"
+        "- Day two - inner #link\nPhoto caption end\n\nName Form text",
+    ),
+    (
+        "basic",
+        "Trips Sail the fjord,\nthen rest. - Day one trip\n- Day two - inner link\n"
+        "Photo caption end Name Form text",
+    ),
+    (
+        "none",
+        "Trips Sail the fjord, then rest. Day one trip Day two inner link "
+        "Photo caption end Name Form text",
+    ),
+])
+def test_layout_output(backend, layout, text):
+    assert gvt.visible_text_from_html(SAMPLE, URL, layout=layout) == SAMPLE_HEADER + text